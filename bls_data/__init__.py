@@ -4,22 +4,52 @@ API and translate returned json data into pandas dataframes.
 
 In this init file, some code exists to initialize the dataframes for the
 area codes that the BLS data uses to identify the region that a seriesID
-pertains to.
+pertains to, along with plain {area_code: title} dicts used for fast
+lookups. Both are loaded lazily the first time they are accessed, so
+importing the module does not parse every csv file.
 """
 import pandas as pd
 import pkg_resources
 
-#Construct QCEW area codes DataFrame from area code csv
-qcew_stream = pkg_resources.resource_stream(__name__, 'data/area_titles.csv')
-qcew_area_codes_df = pd.read_csv(qcew_stream)
-qcew_area_codes_df = qcew_area_codes_df.set_index('area_fips')
+#maps each area code dataframe to its csv file, index column and dtypes
+_AREA_CODE_FILES = {
+    #QCEW area codes
+    'qcew_area_codes_df': ('data/area_titles.csv', 'area_fips', None),
+    #OES area codes
+    'oes_area_codes_df': ('data/oes_areas.csv', 'area_code', {'area_code':str}),
+    #LA area codes for Local Area Employment Statistics locations
+    'la_area_codes_df': ('data/la_area.csv', 'area_code', None),
+}
 
-#Construct OES area codes DataFrame from area code csv
-stream = pkg_resources.resource_stream(__name__, 'data/oes_areas.csv')
-oes_area_codes_df = pd.read_csv(stream, dtype={'area_code':str})
-oes_area_codes_df = oes_area_codes_df.set_index('area_code')
+#maps each area title dict to the area codes dataframe and column it is built from
+_AREA_TITLE_DICTS = {
+    'qcew_area_titles': ('qcew_area_codes_df', 'area_title'),
+    'oes_area_titles': ('oes_area_codes_df', 'area_name'),
+    'la_area_titles': ('la_area_codes_df', 'area_text'),
+}
 
-#Construct LA area codes for Local Area Employment Statistics locations
-stream = pkg_resources.resource_stream(__name__, 'data/la_area.csv')
-la_area_codes_df = pd.read_csv(stream)
-la_area_codes_df = la_area_codes_df.set_index('area_code')
+def __getattr__(name):
+    """
+    Constructs an area codes DataFrame from its csv, or an area title dict from
+    its DataFrame, the first time it is accessed and caches it on the module.
+    """
+    if name in _AREA_TITLE_DICTS:
+        df_name, col = _AREA_TITLE_DICTS[name]
+        area_codes_df = globals().get(df_name)
+        if area_codes_df is None:
+            area_codes_df = __getattr__(df_name)
+        area_titles = area_codes_df[col].to_dict()
+
+        globals()[name] = area_titles
+        return area_titles
+
+    if name not in _AREA_CODE_FILES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    file_name, index_col, dtype = _AREA_CODE_FILES[name]
+    stream = pkg_resources.resource_stream(__name__, file_name)
+    area_codes_df = pd.read_csv(stream, dtype=dtype)
+    area_codes_df = area_codes_df.set_index(index_col)
+
+    globals()[name] = area_codes_df
+    return area_codes_df
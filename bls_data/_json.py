@@ -0,0 +1,28 @@
+"""
+_json
+
+Small wrapper around the json library used for BLS API payloads and saved data. Uses orjson when it is
+installed since it encodes and decodes much faster, and falls back to the standard library json module.
+"""
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+
+def loads(data):
+    """
+    Decodes json from a str or bytes object.
+    """
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj, indent:bool=False) -> bytes:
+    """
+    Encodes an object to utf-8 json bytes, indented with 2 spaces if indent is True.
+    """
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
@@ -11,18 +11,53 @@ with the following values:
     - LA
     - OE
 """
-import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 import requests
-from bls_data import la_area_codes_df, oes_area_codes_df, qcew_area_codes_df
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import bls_data
+from bls_data import _json
+from bls_data.cache import ResponseCache
 
 
 BLS_URL = 'https://api.bls.gov/publicAPI/v2/timeseries/data/'
 
+#the v2 API accepts at most 50 series IDs per query, larger requests are split and fetched concurrently
+MAX_SERIES_PER_REQUEST = 50
+MAX_REQUEST_WORKERS = 4
+
+#shared session so connections to the BLS API are kept alive and reused across requests.
+#the BLS query endpoint is read-only, so POSTs are safe to retry.
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=['POST']),
+))
+
+#area code patterns for the series ID prefixes that _get_location supports
+_EN_RE = re.compile(r'^[A-Z]{3}([\dU][\dS]\d{3})')
+_LA_RE = re.compile(r'^[A-Z]{3}([A-Z]{2}\d{13})')
+_OE_RE = re.compile(r'^[A-Z]*(\d{7})')
+
+#separators used to shorten location names, e.g. 'Phoenix-Mesa-Scottsdale, AZ' -> 'Phoenix-Mesa-Scottsdale'
+_SHORT_LOC_RE = re.compile(r'--|,')
+
+#maps a series ID prefix to its area code pattern and area title dict name.
+#the dicts are loaded lazily by the bls_data package, so they are referenced by name.
+_DISPATCH = {
+    'EN': (_EN_RE, 'qcew_area_titles'),
+    'LA': (_LA_RE, 'la_area_titles'),
+    'OE': (_OE_RE, 'oes_area_titles'),
+}
+
 class BlsData():
     """
     Formats and sends request to Bureau of Labor Statistics API, and creates 2 pandas 
@@ -32,25 +67,50 @@ class BlsData():
         series_ids = list; a list of series IDs that correspond to some BLS data
         start_year = int; the first year to collect data from
         end_year = int; the final year to collect data from
+        cache_dir = str; optional directory to cache raw API results in. Default=None (no caching)
+        cache_ttl = str or int; how long cached results stay valid, e.g. '24h' or seconds. Default='24h'
     
     Attributes:
         raw_data = raw json data returned from the API endpoint
-        raw_df = dataframe created from translating json to pandas DF
-        df = dataframe that has been cleaned and modified to be more human-readable and easier to graph
-        locations = only available on certain series IDs, gets the locations that data pertains to
+        raw_df = dataframe created from translating json to pandas DF, built on first access
+        df = dataframe that has been cleaned and modified to be more human-readable and easier to graph,
+            built on first access
+        locations = only available on certain series IDs, gets the locations that data pertains to,
+            built on first access
+        cache = ResponseCache used for API results, None when caching is disabled
     """
-    def __init__(self, series_ids:list, start_year:int, end_year:str, raw_data=None):
+    def __init__(self, series_ids:list, start_year:int, end_year:str, raw_data=None,
+            cache_dir:str=None, cache_ttl='24h'):
 
         self.series_ids = series_ids
         self.start_year = start_year
         self.end_year = end_year
         self.messages = []
+        self.cache = ResponseCache(cache_dir, cache_ttl) if cache_dir else None
 
         self.raw_data = raw_data if raw_data else self._request_bls_data()
 
-        self.raw_df = self._construct_df()
-        self.df = self._organize_df() if len(self.raw_df) > 0 else None
-        self.locations = self._get_location()
+    @cached_property
+    def raw_df(self) -> pd.DataFrame:
+        """
+        Dataframe created from the raw json data, computed the first time it is accessed.
+        """
+        return self._construct_df()
+
+    @cached_property
+    def df(self) -> pd.DataFrame:
+        """
+        Organized dataframe indexed by date, computed the first time it is accessed.
+        None if no data was returned.
+        """
+        return self._organize_df() if len(self.raw_df) > 0 else None
+
+    @cached_property
+    def locations(self) -> dict:
+        """
+        Mapping of series IDs to location names, computed the first time it is accessed.
+        """
+        return self._get_location()
 
     @classmethod
     def from_json(cls, json_file:str):
@@ -59,8 +119,8 @@ class BlsData():
         API and uses it to create a BlsData object.
         """
         #read file
-        with open(json_file, 'r') as json_file:
-            data = json.load(json_file)
+        with open(json_file, 'rb') as json_file:
+            data = _json.loads(json_file.read())
 
         #construct seriesID list
         series_ids = [series['seriesID'] for series in data]
@@ -79,27 +139,59 @@ class BlsData():
         based on the given attributes.
         Returns a list containing the raw results from the BLS api call.
         """
+        #return cached results for the same request if there are any
+        if self.cache:
+            cache_key = ResponseCache.key(self.series_ids, self.start_year, self.end_year)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         if 'BLS_API_KEY' not in os.environ:
             raise ValueError("BLS_API_KEY environment variable must be set.")
 
+        #split the series IDs into chunks the API accepts, results are kept in chunk order
+        chunks = [self.series_ids[i:i + MAX_SERIES_PER_REQUEST]
+                  for i in range(0, len(self.series_ids), MAX_SERIES_PER_REQUEST)]
+        if len(chunks) == 1:
+            results = [self._fetch_chunk(chunks[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(MAX_REQUEST_WORKERS, len(chunks))) as executor:
+                results = list(executor.map(self._fetch_chunk, chunks))
+
+        self.messages = [message for messages, _ in results for message in messages]
+        series = [bls_series for _, chunk_series in results for bls_series in chunk_series or []]
+
+        if self.cache and series:
+            self.cache.set(cache_key, series)
+
+        return series
+
+    def _fetch_chunk(self, series_ids:list) -> tuple:
+        """
+        Sends a single request to the BLS API for up to MAX_SERIES_PER_REQUEST series IDs.
+        Returns a tuple of the messages and the list of series returned by the API.
+        """
         headers = {
             'content-type' : 'application/json',
+            'accept-encoding' : 'gzip',
         }
-        data = json.dumps({
-            "seriesid" : self.series_ids,
+        payload = {
+            "seriesid" : series_ids,
             "startyear" : self.start_year,
             "endyear" : self.end_year,
             "catalog" : False,
             "annualaverage" : False,
             "aspects" : False,
             "registrationKey" : os.environ.get('BLS_API_KEY'),
-        })
+        }
 
         #make post request
-        response = requests.post(BLS_URL, data=data, headers=headers)
+        response = _SESSION.post(BLS_URL, data=_json.dumps(payload), headers=headers)
+        #decode the body once and read both the messages and the results from it.
+        #failed requests have no Results, their reason is in the messages
+        response_json = _json.loads(response.content)
 
-        self.messages = response.json()['message']
-        return response.json()['Results'].get('series')
+        return response_json.get('message', []), response_json.get('Results', {}).get('series')
 
     def _construct_df(self) -> pd.DataFrame:
         """
@@ -107,65 +199,83 @@ class BlsData():
         API.
         Returns a pandas dataframe
         """
-        #make an empty dataframe with desired cols
         cols = ['year', 'period']
-        bls_df = pd.DataFrame(columns=cols)
 
-        #use for loop to create df, skip entries that returned no data
+        #build one long frame of all series, skip entries that returned no data
+        frames = []
         for bls_series in self.raw_data:
             if not bool(bls_series['data']):
                 continue
 
-            series_df = pd.DataFrame(bls_series['data'])
-            series_df = series_df[cols + ['value']]
-            series_df['value'] = pd.to_numeric(series_df['value'])
-            series_df = series_df.rename(columns={'value' : bls_series['seriesID']})
-            bls_df = bls_df.merge(right=series_df, on=['year', 'period'], how='outer')
+            series_df = pd.DataFrame(bls_series['data'], columns=cols + ['value'])
+            series_df['seriesID'] = bls_series['seriesID']
+            frames.append(series_df)
+
+        if not frames:
+            return pd.DataFrame(columns=cols)
+
+        long_df = pd.concat(frames, ignore_index=True)
+
+        #BLS values are numeric strings, fall back to coercing them if any are malformed (e.g. '-')
+        try:
+            long_df['value'] = long_df['value'].astype('float64')
+        except ValueError:
+            long_df['value'] = pd.to_numeric(long_df['value'], errors='coerce')
+
+        #years and periods repeat for every series, store them as categories to cut memory
+        long_df[cols] = long_df[cols].astype('category')
+
+        #pivot the long frame so each seriesID becomes its own column, keeping the original series order
+        series_order = long_df['seriesID'].unique()
+        bls_df = long_df.pivot(index=cols, columns='seriesID', values='value')
+        bls_df = bls_df.reindex(columns=series_order).rename_axis(columns=None).reset_index()
 
         return bls_df
 
-    def _organize_df(self) -> pd.DataFrame:
+    def _get_dates(self) -> pd.Series:
         """
-        Organizes pandas dataframe depending on the term of the data.
-        Currently works for monthly, quarterly, and annual data.
-        Returns a pandas dataframe.
+        Builds the date for each row of the raw dataframe depending on the term of the data.
+        Currently works for monthly, quarterly, semi-annual, and annual data.
+        Returns a pandas series of YYYY-MM strings, or YYYY strings for annual data.
         """
-        #Deep copy the raw dataframe to avoid overwriting it
-        df = self.raw_df.copy()
+        year = self.raw_df['year'].astype(str)
+        period = self.raw_df['period']
+        term = period.iloc[0][0]
 
-        #quarterly data
-        if df.loc[0]['period'][0] == 'Q':
-            df['period'] = df['period'].str.replace('0', '')
-            df['date'] = df['year'].map(str)+ '-' +df['period'].map(str)
-            df['date'] = pd.to_datetime(df['date']).apply(lambda x: x.strftime('%Y-%m'))
+        #quarterly data, dated by the first month of the quarter
+        if term == 'Q':
+            month = (period.str[1:].astype(int) - 1) * 3 + 1
+            return year.str.cat(month.astype(str).str.zfill(2), sep='-')
 
-        #monthly data
-        if df.loc[0]['period'][0] == 'M':
-            df['period'] = df['period'].str.replace('M', '')
-            df['date'] = df['period'].map(str)+ '-' +df['year'].map(str)
-            df['date'] = pd.to_datetime(df['date'], format='%m-%Y').apply(lambda x: x.strftime('%Y-%m'))
+        #monthly data, periods are already zero padded (M01-M12)
+        if term == 'M':
+            return year.str.cat(period.str[1:], sep='-')
 
         # semi-annual data
-        if df.loc[0]['period'][0] == 'S':
-            # remove 'S', map to int and multiply the half year by 6
-            df['period'] = df['period'].str.replace('S', '')
-            df['period'] = (df['period'].map(int)*6).map(str)
-
-            # format this as quarterly data that only contains months 6 and 12 so it appears as semi-annual
-            df['date'] = df['year'].map(str)+ '-' +df['period'].map(str)
-            df['date'] = pd.to_datetime(df['date']).apply(lambda x: x.strftime('%Y-%m'))
+        if term == 'S':
+            # multiply the half year by 6 so it appears as months 6 and 12
+            month = period.str[1:].astype(int) * 6
+            return year.str.cat(month.astype(str).str.zfill(2), sep='-')
 
         #annual data
-        if df.loc[0]['period'][0] == 'A':
-            df = df.rename(columns={'year':'date'}, errors='raise')
+        if term == 'A':
+            return year
+
+        raise ValueError(f"Unsupported period type: {period.iloc[0]}")
+
+    def _organize_df(self) -> pd.DataFrame:
+        """
+        Organizes pandas dataframe depending on the term of the data.
+        Currently works for monthly, quarterly, semi-annual, and annual data.
+        Returns a pandas dataframe.
+        """
+        #build a new frame from the series columns rather than deep copying the raw dataframe
+        df = self.raw_df.drop(columns=['period', 'year']).assign(date=self._get_dates())
 
         #change index and sort
         df = df.set_index('date')
         df = df.sort_index()
 
-        #drop extra cols
-        df = df.drop(columns=['period', 'year'], errors='ignore')
-
         return df
 
     def write_to_json(self, file_name:str):
@@ -175,8 +285,8 @@ class BlsData():
         Arguments:
             - file_name = str; Name of the file that should be outputted.
         """
-        with open(f"{file_name.split('.')[0]}.json", 'w') as json_out:
-            json.dump(self.raw_data, json_out, indent=4)
+        with open(f"{file_name.split('.')[0]}.json", 'wb') as json_out:
+            json_out.write(_json.dumps(self.raw_data, indent=True))
 
     def create_graph(self, title:str, graph_type:str, custom_column_names:dict=None,
             transpose:bool=False, short_location_names:bool=True, graph_labels:dict=None) -> pd.DataFrame.plot:
@@ -239,16 +349,13 @@ class BlsData():
         if descending:
             table_df = table_df.sort_index(ascending=False)
 
-        #set index column color to the color passed in, set the rest to white and light gray striped
-        fill_color = []
-        for col in [table_df.index.name] + table_df.columns.to_list():
-            if index_color and col == table_df.index.name:
-                fill_color.append(index_color)
-            else:
-                fill_color.append(['white', 'lightgrey']*len(table_df.index))
+        #set index column color to the color passed in, set the rest to white and light gray striped.
+        #the striped list is built once and shared by every column
+        stripes = ['white', 'lightgrey'] * ((len(table_df.index) + 1) // 2)
+        fill_color = [index_color if index_color else stripes] + [stripes] * len(table_df.columns)
 
         #Make list of all df values by column
-        col_vals = [table_df[col].to_list() for col in table_df]
+        col_vals = table_df.to_numpy(dtype=object).T.tolist()
 
         #return the created table including the index
         return go.Figure(data=[go.Table(
@@ -277,7 +384,10 @@ class BlsData():
         table_df = self.df
 
         #replace column names with location names
-        cols = {ser_id: re.split('--|,', loc)[0] for ser_id,loc in self.locations.items()} if short_location_names else self.locations
+        if short_location_names:
+            cols = {ser_id: _SHORT_LOC_RE.split(loc, 1)[0] for ser_id,loc in self.locations.items()}
+        else:
+            cols = dict(self.locations)
         if custom_column_names:
             if not isinstance(custom_column_names, dict):
                 raise TypeError("Custom column names must be of type dict.")
@@ -294,14 +404,12 @@ class BlsData():
         """
         series_id_locations = {}
         for series in self.series_ids:
-            if re.match('EN', series[0:2]):
-                area_code = re.search(r'^[A-Z]{3}([\d|U][\d|S]\d\d\d)', series).group(1)
-                series_id_locations[series] = qcew_area_codes_df.loc[area_code]['area_title']
-            if series[0:2] == 'LA':
-                area_code = re.search(r'^[A-Z]{3}([A-Z]{2}\d{13})', series).group(1)
-                series_id_locations[series] = la_area_codes_df.loc[area_code]['area_text']
-            if re.match('OE', series[0:2]):
-                area_code = re.search(r'^[A-Z]*(\d\d\d\d\d\d\d)', series).group(1)
-                series_id_locations[series] = oes_area_codes_df.loc[area_code]['area_name']
+            handler = _DISPATCH.get(series[:2])
+            if handler is None:
+                continue
+            regex, titles_name = handler
+            match = regex.match(series)
+            if match:
+                series_id_locations[series] = getattr(bls_data, titles_name)[match.group(1)]
 
         return series_id_locations
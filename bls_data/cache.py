@@ -0,0 +1,90 @@
+"""
+cache
+
+This file contains the ResponseCache class that stores raw BLS API results on disk so that repeated
+queries for the same series IDs and years do not need to hit the API again.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from bls_data import _json
+
+
+TTL_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+class ResponseCache():
+    """
+    On-disk cache of raw BLS API results, stored as one json file per request.
+
+    Arguments:
+        cache_dir = str; directory the json files are written to, created if it does not exist
+        ttl = str or int; how long a cached result stays valid, either seconds or a string such as '30m', '24h', '7d'
+    """
+    def __init__(self, cache_dir:str, ttl='24h'):
+        self.cache_dir = cache_dir
+        self.ttl = self._parse_ttl(ttl)
+
+    @staticmethod
+    def _parse_ttl(ttl) -> int:
+        """
+        Converts a ttl given in seconds or as a '<number><unit>' string into seconds.
+        """
+        if isinstance(ttl, (int, float)):
+            return ttl
+
+        match = re.fullmatch(r'(\d+)([smhd])', str(ttl).strip())
+        if not match:
+            raise ValueError(f"Invalid cache ttl '{ttl}'. Expected seconds or a value like '24h'.")
+        return int(match.group(1)) * TTL_UNITS[match.group(2)]
+
+    @staticmethod
+    def key(series_ids:list, start_year, end_year) -> str:
+        """
+        Returns a stable hash of the request parameters, independent of the series ID order.
+        """
+        request = json.dumps({'s': sorted(series_ids), 'y0': str(start_year), 'y1': str(end_year)}, sort_keys=True)
+        return hashlib.sha1(request.encode()).hexdigest()
+
+    def _path(self, key:str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key:str):
+        """
+        Returns the cached result for the key, or None if it is missing or older than the ttl.
+        """
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, 'rb') as json_file:
+                return _json.loads(json_file.read())
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key:str, data):
+        """
+        Writes the result for the key. The file is written to a temp file first and then moved into
+        place so a partially written file is never read.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as json_out:
+                json_out.write(_json.dumps(data))
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def clear(self):
+        """
+        Removes every cached result from the cache directory.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+        for file_name in os.listdir(self.cache_dir):
+            if file_name.endswith('.json'):
+                os.remove(os.path.join(self.cache_dir, file_name))